@@ -7,27 +7,17 @@ This script connects to the PostgreSQL database using environment variables
 and provides basic database operations for testing and management.
 """
 
-import os
 import psycopg2
 from psycopg2.extras import RealDictCursor
-from dotenv import load_dotenv
 import json
 from datetime import datetime
 
-# Load environment variables from .env file
-load_dotenv()
+from src.core.config import get_env_cached, get_pg_params
 
 class DatabaseConnection:
     def __init__(self):
         """Initialize database connection using environment variables"""
-        self.connection_params = {
-            'host': os.getenv('PGHOST'),
-            'database': os.getenv('PGDATABASE'),
-            'user': os.getenv('PGUSER'),
-            'password': os.getenv('PGPASSWORD'),
-            'port': os.getenv('PGPORT', '5432'),
-            'sslmode': 'require'  # Required for most cloud PostgreSQL services
-        }
+        self.connection_params = get_pg_params()
         self.connection = None
     
     def connect(self):
@@ -117,6 +107,10 @@ class DatabaseConnection:
         finally:
             self.disconnect()
 
+# Row layout for the COLUMN DETAILS listing (is_nullable is already 'YES'/'NO')
+COLUMN_ROW_TEMPLATE = "   {0:<3} {column_name:<25} {data_type:<20} {is_nullable:<10}"
+
+
 def main():
     """Main function to test database connection"""
     print("Database Connection Test")
@@ -124,7 +118,7 @@ def main():
     
     # Check if environment variables are set
     required_vars = ['PGHOST', 'PGDATABASE', 'PGUSER', 'PGPASSWORD', 'TABLE_NAME']
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    missing_vars = [var for var in required_vars if not get_env_cached(var)]
     
     if missing_vars:
         print(f"Missing environment variables: {', '.join(missing_vars)}")
@@ -132,7 +126,7 @@ def main():
         return
     
     db = DatabaseConnection()
-    table_name = os.getenv('TABLE_NAME')
+    table_name = get_env_cached('TABLE_NAME')
     
     # Test connection
     print("\n1. Testing database connection...")
@@ -178,9 +172,10 @@ def main():
         print(f"   {'#':<3} {'Column Name':<25} {'Data Type':<20} {'Nullable':<10}")
         print(f"   {'-' * 3} {'-' * 25} {'-' * 20} {'-' * 10}")
         
-        for i, column in enumerate(table_info, 1):
-            nullable = "YES" if column['is_nullable'] == 'YES' else "NO"
-            print(f"   {i:<3} {column['column_name']:<25} {column['data_type']:<20} {nullable:<10}")
+        # Build all rows first and write them with a single print call
+        print("\n".join(
+            COLUMN_ROW_TEMPLATE.format(i, **column) for i, column in enumerate(table_info, 1)
+        ))
             
     else:
         print(f"Table '{table_name}' not found in the database.")
@@ -3,24 +3,16 @@
 Interactive runner script for Neon to Google Sheets sync
 """
 
-import os
-import sys
-from dotenv import load_dotenv
-
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
-
 from src.sync.continuous_sync import NeonToSheetsSync
 from src.sync.one_time_sync import OneTimeSyncToSheets
-
-# Load environment variables
-load_dotenv()
+from src.core.config import get_env_cached
+from src.utils.logging_setup import setup_logging
 
 def show_configuration():
     """Display current configuration"""
-    table_name = os.getenv('TABLE_NAME', 'Not set')
-    sync_interval = os.getenv('SYNC_INTERVAL_MINUTES', '2')
-    spreadsheet_name = os.getenv('SPREADSHEET_NAME', 'Auto-generated')
+    table_name = get_env_cached('TABLE_NAME', 'Not set')
+    sync_interval = get_env_cached('SYNC_INTERVAL_MINUTES', '2')
+    spreadsheet_name = get_env_cached('SPREADSHEET_NAME', 'Auto-generated')
     
     print(f"Current Configuration:")
     print(f"  Table: {table_name}")
@@ -29,6 +21,7 @@ def show_configuration():
 
 def main():
     """Main function for interactive sync runner"""
+    setup_logging()
     print("Neon to Google Sheets Data Sync")
     print("This script will sync data from your Neon database to Google Sheets")
     print("-" * 60)
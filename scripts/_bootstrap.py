@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Shared path setup for the entry point scripts
+"""
+
+import os
+import sys
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+"""
+Entry point for async continuous sync - runs the continuous sync on an asyncio event loop
+"""
+
+import _bootstrap  # noqa: F401 - adds the project root to sys.path
+
+from src.sync.async_sync import main
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,7 @@
 Test database connection script
 """
 
-import sys
-import os
-
-# Add project root to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
+import _bootstrap  # noqa: F401 - adds the project root to sys.path
 
 from src.core.database import main
 
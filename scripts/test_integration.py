@@ -4,11 +4,8 @@ Integration test script to verify the reorganized structure works
 """
 
 import sys
-import os
 
-# Add project root to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
+import _bootstrap  # noqa: F401 - adds the project root to sys.path
 
 def test_imports():
     """Test that all modules can be imported"""
@@ -33,11 +30,10 @@ def test_imports():
 
 def test_environment():
     """Test that environment variables are loaded"""
-    from dotenv import load_dotenv
-    load_dotenv()
+    from src.core.config import get_env_cached
     
     required_vars = ['PGHOST', 'PGDATABASE', 'TABLE_NAME']
-    missing = [var for var in required_vars if not os.getenv(var)]
+    missing = [var for var in required_vars if not get_env_cached(var)]
     
     if missing:
         print(f"✗ Missing environment variables: {missing}")
@@ -47,23 +43,69 @@ def test_environment():
         return True
 
 def test_database_connection():
-    """Test database connection"""
+    """Test database connection and that the configured table exists"""
     try:
+        from src.core.config import get_env_cached
         from src.core.database import DatabaseConnection
-        db = DatabaseConnection()
         
-        if db.connect():
+        # One pooled connection covers both checks
+        with DatabaseConnection() as db:
+            result = db.query_database('SELECT 1 AS ok')
+            if not result or result[0]['ok'] != 1:
+                print("✗ Database connection failed")
+                return False
             print("✓ Database connection successful")
-            db.disconnect()
+            
+            table_name = get_env_cached('TABLE_NAME')
+            if not db.table_exists(table_name):
+                print(f"✗ Table '{table_name}' does not exist")
+                return False
+            print(f"✓ Table '{table_name}' exists")
             return True
-        else:
-            print("✗ Database connection failed")
-            return False
             
     except Exception as e:
         print(f"✗ Database test failed: {e}")
         return False
 
+def test_parser_paths():
+    """Test that the Arrow and pandas CSV parsers produce the same upload cells"""
+    try:
+        import io
+        from src.core.database import _read_copy_csv
+        from src.core.sheets import GoogleSheetsConnection
+        
+        # COPY output in a session with TimeZone = 'Asia/Kolkata'
+        csv_data = (
+            b'id,ratio,created_tz,note\n'
+            b'1,NaN,2024-01-01 10:01:00.5+05:30,NaN\n'
+            b'2,,2024-07-01 15:31:00+05:30,\n'
+            b'3,1.5,,"00123"\n'
+        )
+        column_types = {
+            'id': 'integer',
+            'ratio': 'double precision',
+            'created_tz': 'timestamp with time zone',
+            'note': 'text'
+        }
+        
+        sheets = GoogleSheetsConnection()
+        cells = [
+            sheets.prepare_dataframe_for_upload(
+                _read_copy_csv(io.BytesIO(csv_data), column_types, use_arrow, 'Asia/Kolkata')
+            ).tolist()
+            for use_arrow in (True, False)
+        ]
+        
+        if cells[0] != cells[1]:
+            print(f"✗ Parser paths differ: {cells[0]} != {cells[1]}")
+            return False
+        print("✓ Arrow and pandas parser paths match")
+        return True
+        
+    except ImportError as e:
+        print(f"✗ Parser test skipped, pyarrow is not installed: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("Neon to Google Sheets - Integration Test")
@@ -72,7 +114,8 @@ def main():
     tests = [
         ("Module Imports", test_imports),
         ("Environment Variables", test_environment), 
-        ("Database Connection", test_database_connection)
+        ("Database Connection", test_database_connection),
+        ("Parser Paths", test_parser_paths)
     ]
     
     passed = 0
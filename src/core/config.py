@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Configuration Module
+====================
+
+This module loads the .env file once per process and provides cached access
+to environment-based settings.
+"""
+
+import os
+import threading
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
+
+from dotenv import load_dotenv
+
+# Set once the .env file has been loaded for this process
+_env_loaded = False
+_env_lock = threading.Lock()
+
+# Memoized environment lookups, keyed by variable name
+_env_cache: Dict[str, Optional[str]] = {}
+
+
+def ensure_loaded() -> None:
+    """Load environment variables from the .env file, once per process"""
+    global _env_loaded
+    if not _env_loaded:
+        with _env_lock:
+            if not _env_loaded:
+                load_dotenv()
+                _env_loaded = True
+
+
+def get_env_cached(key: str, default: Optional[str] = None) -> Optional[str]:
+    """
+    Get an environment variable, reading it from the process only once
+
+    Args:
+        key (str): Name of the environment variable
+        default (str, optional): Value returned if the variable is not set
+
+    Returns:
+        str: Variable value, or default if not set
+    """
+    ensure_loaded()
+    if key not in _env_cache:
+        _env_cache[key] = os.environ.get(key)
+    value = _env_cache[key]
+    return default if value is None else value
+
+
+@lru_cache(maxsize=1)
+def get_pg_params() -> Mapping[str, Optional[str]]:
+    """
+    Get PostgreSQL connection parameters from environment variables
+
+    Returns:
+        Mapping: Read-only connection parameters for psycopg2.connect()
+    """
+    return MappingProxyType({
+        'host': get_env_cached('PGHOST'),
+        'database': get_env_cached('PGDATABASE'),
+        'user': get_env_cached('PGUSER'),
+        'password': get_env_cached('PGPASSWORD'),
+        'port': get_env_cached('PGPORT', '5432'),
+        'sslmode': 'require'  # Required for most cloud PostgreSQL services
+    })
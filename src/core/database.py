@@ -6,17 +6,428 @@ Database Connection Module for Neon PostgreSQL
 This module provides database connection and query functionality for Neon PostgreSQL.
 """
 
+import csv
+import io
+import logging
 import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from zoneinfo import ZoneInfo
 import psycopg2
-from psycopg2.extras import RealDictCursor
-from dotenv import load_dotenv
+from psycopg2 import sql
+from psycopg2.pool import ThreadedConnectionPool
 import json
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple, Union
 import pandas as pd
 
-# Load environment variables from .env file
-load_dotenv()
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:
+    pa = None
+
+from src.core.config import get_env_cached, get_pg_params
+from src.utils.logging_setup import setup_logging
+
+logger = logging.getLogger(__name__)
+
+# Shared connection pool, created on first use
+_POOL: Optional[ThreadedConnectionPool] = None
+_POOL_LOCK = threading.Lock()
+
+# information_schema data types that are parsed into typed columns from COPY CSV
+# output; all other types are kept as their PostgreSQL text representation
+_CSV_DTYPES = {
+    'boolean': 'boolean',
+    'smallint': 'Int64',
+    'integer': 'Int64',
+    'bigint': 'Int64',
+    'real': 'float64',
+    'double precision': 'float64'
+}
+_TIMESTAMP_TYPES = {'timestamp without time zone', 'timestamp with time zone'}
+
+# Arrow types for the same data types, used when pyarrow is installed
+if pa is not None:
+    _ARROW_TYPES = {
+        'boolean': pa.bool_(),
+        'smallint': pa.int64(),
+        'integer': pa.int64(),
+        'bigint': pa.int64(),
+        'real': pa.float64(),
+        'double precision': pa.float64(),
+        'timestamp without time zone': pa.timestamp('us'),
+        'timestamp with time zone': pa.timestamp('us', tz='UTC')
+    }
+
+# Metadata queries, prepared once per connection and run with EXECUTE, as
+# (parameter types, parameterized query)
+_METADATA_QUERIES = {
+    'ps_table_exists': (('text',), """
+        SELECT EXISTS (
+            SELECT FROM information_schema.tables 
+            WHERE table_schema = 'public' 
+            AND table_name = %s
+        );
+    """),
+    'ps_table_info': (('text',), """
+        SELECT column_name, data_type, is_nullable, column_default
+        FROM information_schema.columns 
+        WHERE table_name = %s AND table_schema = 'public'
+        ORDER BY ordinal_position;
+    """)
+}
+
+
+def _prepare_statement(name: str) -> str:
+    """
+    Build the PREPARE statement for a metadata query
+    
+    Args:
+        name (str): Name of the query in _METADATA_QUERIES
+        
+    Returns:
+        str: PREPARE statement with the query's %s placeholders numbered $1, $2, ...
+    """
+    arg_types, query = _METADATA_QUERIES[name]
+    parts = query.split('%s')
+    body = parts[0] + ''.join(f'${i}{part}' for i, part in enumerate(parts[1:], 1))
+    return f"PREPARE {name}({', '.join(arg_types)}) AS {body}"
+
+
+_PREPARED_STATEMENTS = {name: _prepare_statement(name) for name in _METADATA_QUERIES}
+
+
+# Planner row estimate from the last ANALYZE; NULL if the table has never been analyzed
+_APPROX_ROW_COUNT_QUERY = """
+    SELECT CASE WHEN reltuples >= 0 THEN reltuples::bigint END
+    FROM pg_class
+    WHERE oid = to_regclass(format('public.%%I', %(table_name)s))
+"""
+
+
+
+@lru_cache(maxsize=32)
+def _select_all_query(table_name: str, ordered: bool = False,
+                      order_by: Optional[str] = None) -> sql.Composed:
+    """
+    Build a SELECT * statement for a table, quoting its name as an identifier
+    
+    Args:
+        table_name (str): Name of the table
+        ordered (bool): Sort rows by the first column
+        order_by (str, optional): Sort rows by this column instead
+        
+    Returns:
+        sql.Composed: Statement, cached per table name
+    """
+    query = sql.SQL('SELECT * FROM {}').format(sql.Identifier(table_name))
+    if order_by:
+        query += sql.SQL(' ORDER BY {}').format(sql.Identifier(order_by))
+    elif ordered:
+        query += sql.SQL(' ORDER BY 1')
+    return query
+
+
+@lru_cache(maxsize=32)
+def _count_query(table_name: str) -> sql.Composed:
+    """
+    Build a COUNT(*) statement for a table, quoting its name as an identifier
+    
+    Args:
+        table_name (str): Name of the table
+        
+    Returns:
+        sql.Composed: Statement, cached per table name
+    """
+    return sql.SQL('SELECT COUNT(*) FROM {}').format(sql.Identifier(table_name))
+
+# Schema lookups cached per table name as (monotonic timestamp, result)
+_table_exists_cache: Dict[str, Tuple[float, bool]] = {}
+_table_info_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+
+
+def _get_cached_schema(cache: Dict[str, Tuple[float, Any]], table_name: str) -> Optional[Any]:
+    """
+    Get a cached schema lookup if it is younger than SCHEMA_TTL_SEC
+    
+    Args:
+        cache (Dict): Schema cache to read from
+        table_name (str): Name of the table
+        
+    Returns:
+        Any: Cached result, None if missing or expired
+    """
+    entry = cache.get(table_name)
+    if entry and time.monotonic() - entry[0] < float(get_env_cached('SCHEMA_TTL_SEC', '300')):
+        return entry[1]
+    return None
+
+
+def clear_schema_cache() -> None:
+    """Drop all cached table existence and structure lookups"""
+    _table_exists_cache.clear()
+    _table_info_cache.clear()
+
+
+class _PooledConnection(psycopg2.extensions.connection):
+    """Database connection that tracks the statements prepared on it"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements = set()
+        # Cleared when the server session does not keep prepared statements, as behind a
+        # transaction-mode pooler such as PgBouncer
+        self.use_prepared = True
+        # Run each statement in its own transaction, so reads need no BEGIN/COMMIT round-trips
+        self.autocommit = True
+
+
+def _get_pool() -> ThreadedConnectionPool:
+    """
+    Get the shared connection pool, creating it on first use
+    
+    Returns:
+        ThreadedConnectionPool: Process-wide PostgreSQL connection pool
+    """
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = ThreadedConnectionPool(
+                    minconn=1,
+                    maxconn=int(get_env_cached('PG_POOL_MAX', '8')),
+                    connection_factory=_PooledConnection,
+                    **get_pg_params()
+                )
+    return _POOL
+
+
+def close_pool() -> None:
+    """Close all pooled database connections"""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.closeall()
+            _POOL = None
+
+
+def _arrow_time_zone(time_zone: Optional[str]) -> str:
+    """
+    Get the Arrow time zone for a PostgreSQL session TimeZone setting
+    
+    Args:
+        time_zone (str, optional): Session TimeZone, such as 'Europe/Berlin'
+        
+    Returns:
+        str: The same zone if it is an IANA zone name, otherwise 'UTC'
+    """
+    try:
+        ZoneInfo(time_zone)
+        return time_zone
+    except Exception:
+        return 'UTC'
+
+
+def _arrow_column_types(columns: List[str], column_types: Dict[str, str],
+                        time_zone: Optional[str] = None) -> Dict[str, 'pa.DataType']:
+    """
+    Get the Arrow type to parse each COPY CSV column into
+    
+    Args:
+        columns (List[str]): Column names from the CSV header
+        column_types (Dict[str, str]): information_schema data type by column name
+        time_zone (str, optional): Session TimeZone the COPY ran in
+        
+    Returns:
+        Dict[str, pa.DataType]: Arrow type by column name
+    """
+    # COPY writes timestamptz values in the session time zone; keep them in it,
+    # as the pandas parser keeps each value's offset
+    arrow_types = dict(_ARROW_TYPES)
+    arrow_types['timestamp with time zone'] = pa.timestamp('us', tz=_arrow_time_zone(time_zone))
+    
+    # Type every column actually present, so columns missing from a stale cached
+    # schema are kept as text instead of going through Arrow type inference
+    return {name: arrow_types.get(column_types.get(name), pa.string()) for name in columns}
+
+
+def _arrow_convert_options(arrow_types: Dict[str, 'pa.DataType']) -> 'pa_csv.ConvertOptions':
+    """
+    Get the Arrow CSV conversion options for COPY output
+    
+    Args:
+        arrow_types (Dict[str, pa.DataType]): Arrow type by column name
+        
+    Returns:
+        pa_csv.ConvertOptions: Conversion options
+    """
+    # Only unquoted empty fields are NULL; keep '' and values like 'NA' as text
+    return pa_csv.ConvertOptions(
+        column_types=arrow_types,
+        null_values=[''],
+        true_values=['t'],
+        false_values=['f'],
+        strings_can_be_null=True,
+        quoted_strings_can_be_null=False
+    )
+
+
+def _pandas_csv_options(columns: List[str], column_types: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Get the pd.read_csv() arguments that parse COPY CSV output
+    
+    Args:
+        columns (List[str]): Column names from the CSV header
+        column_types (Dict[str, str]): information_schema data type by column name
+        
+    Returns:
+        Dict: Keyword arguments for pd.read_csv()
+    """
+    # Only type the columns actually present, in case the cached schema is stale
+    dtype, parse_dates, na_values = {}, [], {}
+    for column in columns:
+        data_type = column_types.get(column)
+        if data_type in _TIMESTAMP_TYPES:
+            parse_dates.append(column)
+        else:
+            dtype[column] = _CSV_DTYPES.get(data_type, str)
+        # PostgreSQL writes float NaN as 'NaN', which pandas only parses as a missing value
+        na_values[column] = ['', 'NaN'] if dtype.get(column) == 'float64' else ['']
+    
+    # Only unquoted empty fields are NULL; keep values like 'NA' as text
+    return {
+        'dtype': dtype,
+        'parse_dates': parse_dates,
+        'date_format': 'ISO8601',
+        'keep_default_na': False,
+        'na_values': na_values,
+        'true_values': ['t'],
+        'false_values': ['f'],
+        'float_precision': 'round_trip'
+    }
+
+
+def _read_copy_arrow(buffer: io.BytesIO, column_types: Dict[str, str],
+                     time_zone: Optional[str] = None) -> 'pa.Table':
+    """
+    Parse COPY ... WITH CSV HEADER output into an Arrow table
+    
+    Args:
+        buffer (io.BytesIO): CSV data written by COPY
+        column_types (Dict[str, str]): information_schema data type by column name
+        time_zone (str, optional): Session TimeZone the COPY ran in
+        
+    Returns:
+        pa.Table: Parsed table data
+    """
+    columns = list(pd.read_csv(buffer, nrows=0).columns)
+    buffer.seek(0)
+    
+    convert_options = _arrow_convert_options(_arrow_column_types(columns, column_types, time_zone))
+    try:
+        return pa_csv.read_csv(buffer, convert_options=convert_options)
+    except pa.ArrowInvalid as e:
+        # Values such as infinity or BC timestamps do not fit the Arrow types;
+        # the pandas parser keeps such columns as text
+        logger.debug("Falling back to the pandas CSV parser: %s", e)
+        buffer.seek(0)
+        return pa.Table.from_pandas(_read_copy_csv(buffer, column_types, use_arrow=False), preserve_index=False)
+
+
+def _read_copy_csv(buffer: io.BytesIO, column_types: Dict[str, str],
+                   use_arrow: bool = True, time_zone: Optional[str] = None) -> pd.DataFrame:
+    """
+    Parse COPY ... WITH CSV HEADER output into a DataFrame
+    
+    Args:
+        buffer (io.BytesIO): CSV data written by COPY
+        column_types (Dict[str, str]): information_schema data type by column name
+        use_arrow (bool): Parse with pyarrow into Arrow-backed columns, if installed
+        time_zone (str, optional): Session TimeZone the COPY ran in
+        
+    Returns:
+        pd.DataFrame: Parsed table data
+    """
+    if use_arrow and pa is not None:
+        # Keep the columns Arrow-backed in pandas, so text is stored as
+        # contiguous UTF-8 instead of one Python object per cell
+        return _read_copy_arrow(buffer, column_types, time_zone).to_pandas(types_mapper=pd.ArrowDtype)
+    
+    columns = list(pd.read_csv(buffer, nrows=0).columns)
+    buffer.seek(0)
+    return pd.read_csv(buffer, **_pandas_csv_options(columns, column_types))
+
+
+def _iter_copy_csv(stream: io.BufferedReader, column_types: Dict[str, str], batch_rows: int,
+                   use_arrow: bool = True, time_zone: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """
+    Parse COPY ... WITH CSV HEADER output in batches of rows as it is read
+    
+    Args:
+        stream (io.BufferedReader): CSV data written by COPY
+        column_types (Dict[str, str]): information_schema data type by column name
+        batch_rows (int): Rows per batch
+        use_arrow (bool): Parse with pyarrow into Arrow-backed columns, if installed
+        time_zone (str, optional): Session TimeZone the COPY ran in
+        
+    Yields:
+        pd.DataFrame: Batch of table data; a single empty batch if there are no rows
+    """
+    header = stream.readline()
+    if not header:
+        return
+    columns = next(csv.reader([header.decode('utf-8')]))
+    
+    if not use_arrow or pa is None:
+        batches = pd.read_csv(stream, header=None, names=columns, chunksize=batch_rows,
+                              **_pandas_csv_options(columns, column_types))
+        empty = True
+        for batch in batches:
+            empty = False
+            yield batch
+        if empty:
+            yield pd.DataFrame({column: pd.Series(dtype=object) for column in columns})
+        return
+    
+    # Timestamps are parsed as text and converted per batch, so a value such as
+    # infinity only keeps its own batch's column as text instead of failing the stream
+    arrow_types = _arrow_column_types(columns, column_types, time_zone)
+    timestamps = {name: arrow_type for name, arrow_type in arrow_types.items()
+                  if pa.types.is_timestamp(arrow_type)}
+    read_types = {name: pa.string() if name in timestamps else arrow_type
+                  for name, arrow_type in arrow_types.items()}
+    
+    def to_frame(table: 'pa.Table') -> pd.DataFrame:
+        for name, arrow_type in timestamps.items():
+            try:
+                i = table.schema.get_field_index(name)
+                table = table.set_column(i, name, table.column(i).cast(arrow_type))
+            except pa.ArrowInvalid:
+                pass
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    
+    # Arrow rejects a stream with no rows after the header
+    if not stream.peek(1):
+        yield to_frame(pa.schema(list(read_types.items())).empty_table())
+        return
+    reader = pa_csv.open_csv(stream, read_options=pa_csv.ReadOptions(column_names=columns),
+                             convert_options=_arrow_convert_options(read_types))
+    
+    # Regroup the reader's byte-sized blocks into batches of batch_rows rows
+    pending = reader.schema.empty_table()
+    yielded = False
+    for record_batch in reader:
+        pending = pa.concat_tables([pending, pa.Table.from_batches([record_batch])])
+        while pending.num_rows >= batch_rows:
+            yield to_frame(pending.slice(0, batch_rows))
+            pending, yielded = pending.slice(batch_rows), True
+    if pending.num_rows or not yielded:
+        yield to_frame(pending)
+
 
 class DatabaseConnection:
     """
@@ -25,15 +436,10 @@ class DatabaseConnection:
     
     def __init__(self):
         """Initialize database connection using environment variables"""
-        self.connection_params = {
-            'host': os.getenv('PGHOST'),
-            'database': os.getenv('PGDATABASE'),
-            'user': os.getenv('PGUSER'),
-            'password': os.getenv('PGPASSWORD'),
-            'port': os.getenv('PGPORT', '5432'),
-            'sslmode': 'require'  # Required for most cloud PostgreSQL services
-        }
+        self.connection_params = get_pg_params()
         self.connection = None
+        # Parse table data with pyarrow unless USE_ARROW=0
+        self.use_arrow = pa is not None and get_env_cached('USE_ARROW', '1') == '1'
     
     def connect(self) -> bool:
         """
@@ -42,19 +448,56 @@ class DatabaseConnection:
         Returns:
             bool: True if connection successful, False otherwise
         """
+        if self.connection and not self.connection.closed:
+            return True
+        
         try:
-            self.connection = psycopg2.connect(**self.connection_params)
-            print("Successfully connected to PostgreSQL database")
+            self.connection = _get_pool().getconn()
+            logger.debug("Successfully connected to PostgreSQL database")
             return True
         except Exception as e:
-            print(f"Error connecting to database: {e}")
+            logger.error("Error connecting to database: %s", e)
             return False
     
     def disconnect(self) -> None:
-        """Close database connection"""
+        """Return database connection to the pool"""
         if self.connection:
-            self.connection.close()
-            print("Database connection closed")
+            _get_pool().putconn(self.connection)
+            self.connection = None
+            logger.debug("Database connection closed")
+    
+    def __enter__(self) -> 'DatabaseConnection':
+        """Hold one connection for all calls made inside the with block"""
+        self.connect()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        """Release the held connection"""
+        self.disconnect()
+        return False
+    
+    @contextmanager
+    def _pooled_connection(self) -> Iterator[psycopg2.extensions.connection]:
+        """
+        Use the held connection, or borrow one from the pool for the block
+        
+        Yields:
+            connection: Open database connection
+        """
+        if self.connection and not self.connection.closed:
+            conn, borrowed = self.connection, False
+        else:
+            conn, borrowed = _get_pool().getconn(), True
+        
+        try:
+            yield conn
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            if borrowed:
+                _get_pool().putconn(conn)
     
     def test_connection(self) -> bool:
         """
@@ -63,89 +506,141 @@ class DatabaseConnection:
         Returns:
             bool: True if connection test successful, False otherwise
         """
-        if not self.connect():
-            return False
-        
         try:
-            cursor = self.connection.cursor(cursor_factory=RealDictCursor)
-            
-            # Test basic query
-            cursor.execute("SELECT version();")
-            version = cursor.fetchone()
-            print(f"PostgreSQL Version: {version['version']}")
-            
-            # Show current database
-            cursor.execute("SELECT current_database();")
-            db_name = cursor.fetchone()
-            print(f"Current Database: {db_name['current_database']}")
-            
-            # List tables
-            cursor.execute("""
-                SELECT table_name 
-                FROM information_schema.tables 
-                WHERE table_schema = 'public'
-                ORDER BY table_name;
-            """)
-            tables = cursor.fetchall()
-            
-            if tables:
-                print(f"Tables in database:")
-                for table in tables:
-                    print(f"   - {table['table_name']}")
-            else:
-                print("No tables found in database")
-            
-            cursor.close()
-            return True
+            with self._pooled_connection() as conn:
+                cursor = conn.cursor()
+                
+                # Get version, current database and tables in a single round-trip
+                cursor.execute("""
+                    SELECT version(), current_database(), ARRAY(
+                        SELECT table_name::text 
+                        FROM information_schema.tables 
+                        WHERE table_schema = 'public'
+                        ORDER BY table_name
+                    );
+                """)
+                version, db_name, tables = cursor.fetchone()
+                logger.info("PostgreSQL Version: %s", version)
+                logger.info("Current Database: %s", db_name)
+                
+                if tables:
+                    logger.info("Tables in database:")
+                    for table in tables:
+                        logger.info("   - %s", table)
+                else:
+                    logger.info("No tables found in database")
+                
+                cursor.close()
+                return True
             
         except Exception as e:
-            print(f"Error testing connection: {e}")
+            logger.error("Error testing connection: %s", e)
             return False
-        finally:
-            self.disconnect()
     
-    def query_database(self, query: str, params: Optional[tuple] = None) -> Optional[List[Dict[str, Any]]]:
+    def query_database(self, query: Union[str, sql.Composable], params: Optional[tuple] = None,
+                       returns_rows: Optional[bool] = None) -> Optional[List[Dict[str, Any]]]:
         """
         Execute a custom query on the database
         
         Args:
-            query (str): SQL query to execute
+            query (str or sql.Composable): SQL query to execute
             params (tuple, optional): Parameters for the query
+            returns_rows (bool, optional): Whether the query returns rows; detected
+                from the cursor result description when not given
             
         Returns:
             List[Dict] or bool or None: Query results for SELECT, True for other operations, None on error
         """
-        # Use existing connection or create a new one
-        need_to_disconnect = False
-        if not self.connection:
-            if not self.connect():
-                return None
-            need_to_disconnect = True
+        # Use the held connection or borrow one from the pool
+        try:
+            with self._pooled_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(query, params or ())
+                    
+                    # SELECT queries and RETURNING clauses produce a result description
+                    if returns_rows is None:
+                        returns_rows = cursor.description is not None
+                    
+                    if returns_rows:
+                        columns = [desc[0] for desc in cursor.description]
+                        results = cursor.fetchall()
+                        return [dict(zip(columns, row)) for row in results]
+                    else:
+                        # For INSERT, UPDATE, DELETE queries without RETURNING
+                        conn.commit()
+                        return True
+                
+        except Exception as e:
+            logger.error("Error executing query: %s", e)
+            return None
+    
+    def _query_scalar(self, query: Union[str, sql.Composable], params: Optional[tuple] = None) -> Any:
+        """
+        Execute a query that returns a single value
         
+        Args:
+            query (str or sql.Composable): SQL query to execute
+            params (tuple, optional): Parameters for the query
+            
+        Returns:
+            Any: First column of the first row, None if no rows or on error
+        """
         try:
-            cursor = self.connection.cursor(cursor_factory=RealDictCursor)
-            cursor.execute(query, params or ())
+            with self._pooled_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(query, params or ())
+                    row = cursor.fetchone()
+            return row[0] if row else None
             
-            # Check if it's a SELECT query or has RETURNING clause
-            if query.strip().upper().startswith('SELECT') or 'RETURNING' in query.upper():
-                results = cursor.fetchall()
-                self.connection.commit()
-                cursor.close()
-                return [dict(row) for row in results]
-            else:
-                # For INSERT, UPDATE, DELETE queries without RETURNING
-                self.connection.commit()
-                cursor.close()
-                return True
-                
         except Exception as e:
-            print(f"Error executing query: {e}")
-            self.connection.rollback()
+            logger.error("Error executing query: %s", e)
+            return None
+    
+    def _query_prepared(self, name: str, params: tuple) -> Optional[List[Dict[str, Any]]]:
+        """
+        Execute a prepared statement, preparing it on first use of a connection
+        
+        Falls back to the plain parameterized query on connections whose server
+        session does not match the statements prepared on it.
+        
+        Args:
+            name (str): Name of the statement in _PREPARED_STATEMENTS
+            params (tuple): Parameters for the statement
+            
+        Returns:
+            List[Dict]: Query results, None on error
+        """
+        execute = f"EXECUTE {name}({', '.join(['%s'] * len(params))});"
+        
+        def run(cursor, prepare: bool) -> None:
+            # PREPARE and the first EXECUTE are sent together in one round-trip
+            cursor.execute(_PREPARED_STATEMENTS[name] + execute if prepare else execute, params)
+        
+        try:
+            with self._pooled_connection() as conn:
+                with conn.cursor() as cursor:
+                    if not conn.use_prepared:
+                        cursor.execute(_METADATA_QUERIES[name][1], params)
+                    else:
+                        try:
+                            run(cursor, name not in conn.prepared_statements)
+                            conn.prepared_statements.add(name)
+                        except (psycopg2.errors.InvalidSqlStatementName,
+                                psycopg2.errors.DuplicatePreparedStatement):
+                            # The statement is missing or already exists on the server session,
+                            # so statements are not kept per connection here
+                            conn.rollback()
+                            conn.use_prepared = False
+                            conn.prepared_statements.clear()
+                            cursor.execute(_METADATA_QUERIES[name][1], params)
+                    
+                    columns = [desc[0] for desc in cursor.description]
+                    results = cursor.fetchall()
+            return [dict(zip(columns, row)) for row in results]
+            
+        except Exception as e:
+            logger.error("Error executing query: %s", e)
             return None
-        finally:
-            # Only disconnect if we created the connection in this method
-            if need_to_disconnect:
-                self.disconnect()
     
     def table_exists(self, table_name: str) -> bool:
         """
@@ -157,16 +652,17 @@ class DatabaseConnection:
         Returns:
             bool: True if table exists, False otherwise
         """
-        query = """
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_schema = 'public' 
-                AND table_name = %s
-            );
-        """
+        cached = _get_cached_schema(_table_exists_cache, table_name)
+        if cached is not None:
+            return cached
+        
+        result = self._query_prepared('ps_table_exists', (table_name,))
+        if not result:
+            return False
         
-        result = self.query_database(query, (table_name,))
-        return result and result[0]['exists'] if result else False
+        exists = result[0]['exists']
+        _table_exists_cache[table_name] = (time.monotonic(), exists)
+        return exists
     
     def get_table_info(self, table_name: str) -> Optional[List[Dict[str, Any]]]:
         """
@@ -178,129 +674,342 @@ class DatabaseConnection:
         Returns:
             List[Dict]: Table column information
         """
-        query = """
-            SELECT column_name, data_type, is_nullable, column_default
-            FROM information_schema.columns 
-            WHERE table_name = %s AND table_schema = 'public'
-            ORDER BY ordinal_position;
-        """
+        cached = _get_cached_schema(_table_info_cache, table_name)
+        if cached is not None:
+            return cached
         
-        return self.query_database(query, (table_name,))
+        table_info = self._query_prepared('ps_table_info', (table_name,))
+        if table_info is not None:
+            _table_info_cache[table_name] = (time.monotonic(), table_info)
+        return table_info
     
-    def get_row_count(self, table_name: str) -> Optional[int]:
+    def get_row_count(self, table_name: str, exact: bool = True) -> Optional[int]:
         """
         Get the number of rows in a table
         
         Args:
             table_name (str): Name of the table
+            exact (bool): Count rows with COUNT(*); if False, use the planner estimate
             
         Returns:
             int: Number of rows, None on error
         """
-        query = f'SELECT COUNT(*) as row_count FROM "{table_name}";'
-        result = self.query_database(query)
-        return result[0]['row_count'] if result else None
+        if not exact:
+            return self.get_approx_row_count(table_name)
+        
+        return self._query_scalar(_count_query(table_name))
+    
+    def get_approx_row_count(self, table_name: str) -> Optional[int]:
+        """
+        Get the estimated number of rows in a table without scanning it
+        
+        Uses pg_class.reltuples from the last ANALYZE, falling back to an exact
+        count if the table has never been analyzed.
+        
+        Args:
+            table_name (str): Name of the table
+            
+        Returns:
+            int: Estimated number of rows, None on error
+        """
+        estimate = self._query_scalar(_APPROX_ROW_COUNT_QUERY, {'table_name': table_name})
+        return estimate if estimate is not None else self.get_row_count(table_name)
+    
+    def get_table_summary(self, table_name: str,
+                          exact_count: bool = True) -> Tuple[bool, Optional[List[Dict[str, Any]]], Optional[int]]:
+        """
+        Check a table and get its structure and row count in a single query
+        
+        Args:
+            table_name (str): Name of the table
+            exact_count (bool): Count rows with COUNT(*); if False, use the planner estimate
+            
+        Returns:
+            Tuple: (exists, column information, row count), with
+                (False, None, None) if the table is missing or on error
+        """
+        if exact_count:
+            count_query = _count_query(table_name)
+        else:
+            count_query = sql.SQL(_APPROX_ROW_COUNT_QUERY)
+        
+        query = sql.SQL("""
+            WITH e AS (
+                SELECT EXISTS (
+                    SELECT FROM information_schema.tables 
+                    WHERE table_schema = 'public' 
+                    AND table_name = %(table_name)s
+                ) AS table_exists
+            ),
+            i AS (
+                SELECT column_name, data_type, is_nullable, column_default, ordinal_position
+                FROM information_schema.columns 
+                WHERE table_name = %(table_name)s AND table_schema = 'public'
+            ),
+            c AS (
+                {}
+            )
+            SELECT
+                (SELECT table_exists FROM e),
+                (SELECT json_agg(json_build_object(
+                    'column_name', column_name,
+                    'data_type', data_type,
+                    'is_nullable', is_nullable,
+                    'column_default', column_default
+                ) ORDER BY ordinal_position) FROM i),
+                (SELECT * FROM c);
+        """).format(count_query)
+        
+        try:
+            with self._pooled_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(query, {'table_name': table_name})
+                    exists, table_info, row_count = cursor.fetchone()
+            
+            if exists and row_count is None:
+                # Table has never been analyzed, so there is no estimate
+                row_count = self.get_row_count(table_name)
+            return exists, table_info, row_count
+        except psycopg2.errors.UndefinedTable:
+            return False, None, None
+        except Exception as e:
+            logger.error("Error retrieving table summary: %s", e)
+            return False, None, None
+    
+    def iter_table_data(self, table_name: str, ordered: bool = False,
+                        batch_rows: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Stream data from a table as pandas DataFrame batches
+        
+        COPY output is parsed as it arrives through a pipe, so only one batch of
+        rows is held in memory. Batches are typed as by get_table_data().
+        
+        Args:
+            table_name (str): Name of the table to query
+            ordered (bool): Sort rows by the first column
+            batch_rows (int, optional): Rows per batch, defaults to FETCH_SIZE
+            
+        Yields:
+            pd.DataFrame: Batch of table data; a single empty batch if the table has no rows
+        """
+        batch_rows = batch_rows or int(get_env_cached('FETCH_SIZE', '10000'))
+        
+        # Column types from the (cached) table structure, to parse the CSV into matching dtypes
+        table_info = self.get_table_info(table_name) or []
+        column_types = {column['column_name']: column['data_type'] for column in table_info}
+        copy = sql.SQL('COPY ({}) TO STDOUT WITH CSV HEADER').format(_select_all_query(table_name, ordered))
+        
+        with self._pooled_connection() as conn:
+            time_zone = conn.get_parameter_status('TimeZone')
+            read_fd, write_fd = os.pipe()
+            errors = []
+            
+            def write_copy() -> None:
+                # Closing the pipe ends the stream for the reader, also on error
+                try:
+                    with open(write_fd, 'wb') as pipe, conn.cursor() as cursor:
+                        cursor.copy_expert(copy, pipe)
+                except Exception as e:
+                    errors.append(e)
+            
+            writer = threading.Thread(target=write_copy, daemon=True)
+            with open(read_fd, 'rb') as pipe:
+                writer.start()
+                try:
+                    yield from _iter_copy_csv(pipe, column_types, batch_rows, self.use_arrow, time_zone)
+                finally:
+                    # Stop a COPY the caller did not read to the end
+                    if writer.is_alive():
+                        conn.cancel()
+                        pipe.close()
+                    writer.join()
+            
+            if errors:
+                raise errors[0]
     
-    def get_table_data(self, table_name: str) -> Optional[pd.DataFrame]:
+    def get_table_data(self, table_name: str, ordered: bool = False,
+                       order_by: Optional[str] = None) -> Optional[pd.DataFrame]:
         """
         Get all data from a table as a pandas DataFrame
         
         Args:
             table_name (str): Name of the table to query
+            ordered (bool): Sort rows by the first column
+            order_by (str, optional): Sort rows by this column instead
             
         Returns:
             pd.DataFrame: DataFrame containing all table data, None on error
         """
-        # Ensure we have a valid connection
-        if not self.connection or self.connection.closed:
-            if not self.connect():
-                return None
-        
         try:
             # Query to get all data from the table (with proper quoting for case-sensitive table names)
-            query = f'SELECT * FROM "{table_name}" ORDER BY 1;'
+            query = _select_all_query(table_name, ordered, order_by)
+            buffer, column_types, time_zone = self._copy_table_csv(table_name, query)
+            df = _read_copy_csv(buffer, column_types, self.use_arrow, time_zone)
             
-            cursor = self.connection.cursor()
-            cursor.execute(query)
-            columns = [desc[0] for desc in cursor.description]
-            data = cursor.fetchall()
-            cursor.close()
-            
-            if not data:
-                print("No data found in table")
+            if df.empty:
+                logger.info("No data found in table")
                 return pd.DataFrame()  # Return empty DataFrame instead of None
-                
-            # Convert to pandas DataFrame
-            df = pd.DataFrame(data, columns=columns)
             
-            print(f"Retrieved {len(df)} rows and {len(df.columns)} columns from table '{table_name}'")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Retrieved %d rows and %d columns from table '%s'", len(df), len(df.columns), table_name)
             return df
             
         except Exception as e:
-            print(f"Error retrieving table data: {e}")
+            logger.error("Error retrieving table data: %s", e)
             return None
+    
+    def get_table_arrow(self, table_name: str, ordered: bool = False) -> Optional['pa.Table']:
+        """
+        Get all data from a table as an Arrow table
+        
+        Args:
+            table_name (str): Name of the table to query
+            ordered (bool): Sort rows by the first column
+            
+        Returns:
+            pa.Table: Table data, None on error or if pyarrow is not installed
+        """
+        if pa is None:
+            logger.error("Error retrieving table data: pyarrow is not installed")
+            return None
+        
+        try:
+            buffer, column_types, time_zone = self._copy_table_csv(table_name, _select_all_query(table_name, ordered))
+            table = _read_copy_arrow(buffer, column_types, time_zone)
+            
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Retrieved %d rows and %d columns from table '%s'",
+                            table.num_rows, table.num_columns, table_name)
+            return table
+            
+        except Exception as e:
+            logger.error("Error retrieving table data: %s", e)
+            return None
+    
+    def get_table_data_since(self, table_name: str, column: str, watermark: Any) -> Optional[pd.DataFrame]:
+        """
+        Get the rows of a table whose watermark column is greater than a given value
+        
+        Args:
+            table_name (str): Name of the table to query
+            column (str): Monotonic column, such as an id or insert timestamp
+            watermark (Any): Largest value of the column already synced
+            
+        Returns:
+            pd.DataFrame: New rows ordered by the watermark column, None on error
+        """
+        try:
+            query = sql.SQL('SELECT * FROM {table} WHERE {column} > %s ORDER BY {column}').format(
+                table=sql.Identifier(table_name),
+                column=sql.Identifier(column)
+            )
+            buffer, column_types, time_zone = self._copy_table_csv(table_name, query, (watermark,))
+            df = _read_copy_csv(buffer, column_types, self.use_arrow, time_zone)
+            
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Retrieved %d new rows from table '%s'", len(df), table_name)
+            return df
+            
+        except Exception as e:
+            logger.error("Error retrieving new table data: %s", e)
+            return None
+    
+    def _copy_table_csv(self, table_name: str, query: sql.Composable,
+                        params: Optional[tuple] = None) -> Tuple[io.BytesIO, Dict[str, str], Optional[str]]:
+        """
+        Copy the result of a query on a table as CSV
+        
+        Args:
+            table_name (str): Name of the table being queried
+            query (sql.Composable): SELECT statement to copy
+            params (tuple, optional): Parameters for the query
+            
+        Returns:
+            Tuple: (CSV buffer positioned at the start, data type by column name,
+                session TimeZone)
+        """
+        # Column types from the (cached) table structure, to parse the CSV into matching dtypes
+        table_info = self.get_table_info(table_name) or []
+        column_types = {column['column_name']: column['data_type'] for column in table_info}
+        
+        with self._pooled_connection() as conn:
+            with conn.cursor() as cursor:
+                # COPY takes no parameters, so bind them into the statement client-side
+                if params:
+                    query = sql.SQL(cursor.mogrify(query, params).decode())
+                buffer = io.BytesIO()
+                cursor.copy_expert(sql.SQL('COPY ({}) TO STDOUT WITH CSV HEADER').format(query), buffer)
+            time_zone = conn.get_parameter_status('TimeZone')
+        
+        buffer.seek(0)
+        return buffer, column_types, time_zone
+
+
+# Row layout for the COLUMN DETAILS listing (is_nullable is already 'YES'/'NO')
+COLUMN_ROW_TEMPLATE = "   {0:<3} {column_name:<25} {data_type:<20} {is_nullable:<10}"
 
 
 def main():
     """Main function to test database connection"""
+    setup_logging()
+    
     print("Database Connection Test")
     print("=" * 60)
     
     # Check if environment variables are set
     required_vars = ['PGHOST', 'PGDATABASE', 'PGUSER', 'PGPASSWORD', 'TABLE_NAME']
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    missing_vars = [var for var in required_vars if not get_env_cached(var)]
     
     if missing_vars:
         print(f"Missing environment variables: {', '.join(missing_vars)}")
         print("Make sure your .env file contains all required database credentials")
         return
     
-    db = DatabaseConnection()
-    table_name = os.getenv('TABLE_NAME')
+    table_name = get_env_cached('TABLE_NAME')
     
-    # Test connection
-    print("\n1. Testing database connection...")
-    if not db.test_connection():
-        print("Connection test failed. Please check your credentials.")
-        return
-    
-    print("\nDatabase connection successful!")
-    
-    # Connect to the specified table and show summary
-    print(f"\n2. Connecting to table '{table_name}'...")
-    print("=" * 60)
-    
-    # Check if table exists
-    if not db.table_exists(table_name):
-        print(f"Table '{table_name}' not found in the database.")
-        print("Please check the TABLE_NAME in your .env file.")
-        return
-    
-    print(f"Successfully connected to table '{table_name}'!")
-    
-    # Get table info
-    table_info = db.get_table_info(table_name)
-    row_count = db.get_row_count(table_name)
-    
-    if table_info:
-        # Display table summary
-        print(f"\nTABLE SUMMARY:")
-        print(f"   Table Name: {table_name}")
-        print(f"   Column Count: {len(table_info)}")
-        print(f"   Row Count: {row_count:,}" if row_count is not None else "   Row Count: Unable to retrieve")
+    # Hold one connection for the test and the table summary
+    with DatabaseConnection() as db:
+        # Test connection
+        print("\n1. Testing database connection...")
+        if not db.test_connection():
+            print("Connection test failed. Please check your credentials.")
+            return
         
-        print(f"\nCOLUMN DETAILS:")
-        print(f"   {'#':<3} {'Column Name':<25} {'Data Type':<20} {'Nullable':<10}")
-        print(f"   {'-' * 3} {'-' * 25} {'-' * 20} {'-' * 10}")
+        print("\nDatabase connection successful!")
         
-        for i, column in enumerate(table_info, 1):
-            nullable = "YES" if column['is_nullable'] == 'YES' else "NO"
-            print(f"   {i:<3} {column['column_name']:<25} {column['data_type']:<20} {nullable:<10}")
-    
-    print(f"\nYou can now use this DatabaseConnection class to:")
-    print("   - Execute custom queries with db.query_database()")
-    print(f"   - Query the '{table_name}' table")
-    print("   - Perform any database operations you need")
+        # Connect to the specified table and show summary
+        print(f"\n2. Connecting to table '{table_name}'...")
+        print("=" * 60)
+        
+        # Check table, get table info and row count in a single round-trip
+        exists, table_info, row_count = db.get_table_summary(table_name, exact_count=False)
+        if not exists:
+            print(f"Table '{table_name}' not found in the database.")
+            print("Please check the TABLE_NAME in your .env file.")
+            return
+        
+        print(f"Successfully connected to table '{table_name}'!")
+        
+        if table_info:
+            # Display table summary
+            print(f"\nTABLE SUMMARY:")
+            print(f"   Table Name: {table_name}")
+            print(f"   Column Count: {len(table_info)}")
+            print(f"   Row Count (estimated): {row_count:,}" if row_count is not None else "   Row Count: Unable to retrieve")
+            
+            print(f"\nCOLUMN DETAILS:")
+            print(f"   {'#':<3} {'Column Name':<25} {'Data Type':<20} {'Nullable':<10}")
+            print(f"   {'-' * 3} {'-' * 25} {'-' * 20} {'-' * 10}")
+            
+            # Build all rows first and write them with a single print call
+            print("\n".join(
+                COLUMN_ROW_TEMPLATE.format(i, **column) for i, column in enumerate(table_info, 1)
+            ))
+        
+        print(f"\nYou can now use this DatabaseConnection class to:")
+        print("   - Execute custom queries with db.query_database()")
+        print(f"   - Query the '{table_name}' table")
+        print("   - Perform any database operations you need")
 
 
 if __name__ == "__main__":
@@ -6,15 +6,183 @@ Google Sheets Connection Module
 This module provides Google Sheets API connectivity and operations.
 """
 
-import os
+import json
+import random
+import time
 import gspread
-from dotenv import load_dotenv
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Callable, Iterable, Iterator, TypeVar, Union
 from datetime import datetime
+import numpy as np
 import pandas as pd
+from pandas.api.types import infer_dtype, is_datetime64_any_dtype, is_integer_dtype
+from gspread.utils import absolute_range_name, rowcol_to_a1
+from google.auth.exceptions import RefreshError
+from google.auth.transport.requests import Request
+from requests.adapters import HTTPAdapter
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+from src.core.config import get_env_cached
+
+T = TypeVar('T')
+
+# Upload payload: rows of cell values, or a 2-D object array of them
+Values = Union[List[List[Any]], np.ndarray]
+
+# Sheets API status codes worth retrying: rate limiting and transient server errors
+_RETRY_STATUSES = (429, 500, 503)
+
+
+def _retry(fn: Callable[..., T], *args, retries: int = 6, base: float = 1.0,
+           cap: float = 64.0, statuses: Tuple[int, ...] = _RETRY_STATUSES, **kwargs) -> T:
+    """
+    Call a Google Sheets API function, retrying rate-limit and transient server
+    errors with exponential backoff and jitter
+    
+    Args:
+        fn (Callable): gspread or SheetsV4Client function or method to call
+        *args: Positional arguments for fn
+        retries (int): Maximum number of retries
+        base (float): Delay before the first retry, in seconds
+        cap (float): Maximum backoff delay, in seconds
+        statuses (Tuple[int, ...]): HTTP statuses to retry
+        **kwargs: Keyword arguments for fn
+        
+    Returns:
+        Any: Result of fn
+    """
+    for attempt in range(retries + 1):
+        try:
+            return fn(*args, **kwargs)
+        except (gspread.exceptions.APIError, HttpError) as e:
+            status = e.response.status_code if isinstance(e, gspread.exceptions.APIError) else e.resp.status
+            if status not in statuses or attempt == retries:
+                raise
+            delay = min(cap, base * 2 ** attempt) + random.uniform(0, 1)
+            print(f"Google Sheets API error {status}, retrying in {delay:.1f}s "
+                  f"(attempt {attempt + 1}/{retries})")
+            time.sleep(delay)
+
+
+def _to_values(data: Values) -> List[List[Any]]:
+    """
+    Convert an upload payload to the nested lists gspread serializes to JSON
+    
+    Args:
+        data (Values): Rows of cell values, or a 2-D object array
+        
+    Returns:
+        List[List]: Rows of cell values
+    """
+    return data.tolist() if isinstance(data, np.ndarray) else data
+
+
+def _a1_range(nrows: int, ncols: int, start_row: int = 1) -> str:
+    """
+    Get the A1 range covering a block of cells starting in column A
+    
+    Args:
+        nrows (int): Number of rows
+        ncols (int): Number of columns
+        start_row (int): First row of the block
+        
+    Returns:
+        str: A1 range such as 'A1:D20'
+    """
+    end_row = start_row + max(nrows, 1) - 1
+    return f"{rowcol_to_a1(start_row, 1)}:{rowcol_to_a1(end_row, max(ncols, 1))}"
+
+
+def _extent(data: Union[Values, pd.DataFrame]) -> Tuple[int, int]:
+    """
+    Get the number of rows and columns of an upload payload
+    
+    Args:
+        data (Values or pd.DataFrame): Rows of cell values, a 2-D object array,
+            or a DataFrame uploaded with its header row
+        
+    Returns:
+        Tuple[int, int]: (rows, columns)
+    """
+    if isinstance(data, pd.DataFrame):
+        return len(data) + 1, len(data.columns)
+    return len(data), len(data[0]) if len(data) else 0
+
+
+def _data_range(data: Values, start_row: int = 1) -> str:
+    """
+    Get the A1 range exactly covering an upload payload
+    
+    Args:
+        data (Values): Rows of cell values, or a 2-D object array
+        start_row (int): Row the payload is written at
+        
+    Returns:
+        str: A1 range of the payload
+    """
+    return _a1_range(*_extent(data), start_row)
+
+
+def metadata_values(metadata: Dict[str, Any]) -> List[List[str]]:
+    """
+    Build the Sync_Metadata worksheet rows from a metadata dictionary
+    
+    Args:
+        metadata (Dict): Metadata dictionary
+        
+    Returns:
+        List[List[str]]: Attribute/value rows ready for upload
+    """
+    return [["Attribute", "Value"], *([key, str(value)] for key, value in metadata.items())]
+
+
+def _chunk_rows() -> int:
+    """
+    Get the maximum number of rows sent in one Sheets update request
+    
+    Returns:
+        int: SHEETS_CHUNK_ROWS, default 20000
+    """
+    return int(get_env_cached('SHEETS_CHUNK_ROWS', '20000'))
+
+
+class SheetsV4Client:
+    """
+    Minimal Sheets API v4 values client built on google-api-python-client,
+    with the same values_batch_update signature as gspread.Spreadsheet
+    """
+    
+    def __init__(self, credentials: Any, spreadsheet_id: str):
+        """
+        Build the Sheets v4 service from the bundled discovery document
+        
+        Args:
+            credentials: Authorized google-auth credentials
+            spreadsheet_id (str): ID of the spreadsheet to write to
+        """
+        self.service = build("sheets", "v4", credentials=credentials, cache_discovery=False)
+        self.spreadsheet_id = spreadsheet_id
+    
+    def values_batch_update(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Write several value ranges with one spreadsheets.values.batchUpdate request
+        
+        Args:
+            body (Dict): Request body with valueInputOption and data
+            
+        Returns:
+            Dict: API response
+        """
+        return self.service.spreadsheets().values().batchUpdate(
+            spreadsheetId=self.spreadsheet_id, body=body
+        ).execute()
 
-# Load environment variables
-load_dotenv()
 
 class GoogleSheetsConnection:
     """
@@ -23,9 +191,17 @@ class GoogleSheetsConnection:
     
     def __init__(self):
         """Initialize Google Sheets connection using environment variables"""
-        self.spreadsheet_name = os.getenv("SPREADSHEET_NAME") or os.getenv("TABLE_NAME") or "neon_to_google_sheets"
+        self.spreadsheet_name = get_env_cached("SPREADSHEET_NAME") or get_env_cached("TABLE_NAME") or "neon_to_google_sheets"
         self.gc = None
         self.spreadsheet = None
+        # Authorized user info from the OAuth flow, to rebuild the client without signing in again
+        self._authorized_user: Optional[Dict[str, Any]] = None
+        # Bounding box of the last payload written to each worksheet, as (rows, columns)
+        self._last_extents: Dict[str, Tuple[int, int]] = {}
+        # Sheets v4 client for bulk data writes, when SHEETS_V4_CLIENT=1
+        self._v4_client: Optional[SheetsV4Client] = None
+        # Worksheet handles by title as (monotonic timestamp, worksheet)
+        self._ws_cache: Dict[str, Tuple[float, gspread.Worksheet]] = {}
         self.credentials = self._build_credentials()
     
     def _build_credentials(self) -> Dict[str, Any]:
@@ -37,14 +213,14 @@ class GoogleSheetsConnection:
         """
         return {
             "installed": {
-                "client_id": os.getenv("CLIENT_ID"),
-                "project_id": os.getenv("PROJECT_ID"),
-                "auth_uri": os.getenv("AUTH_URI", "https://accounts.google.com/o/oauth2/auth"),
-                "token_uri": os.getenv("TOKEN_URI", "https://oauth2.googleapis.com/token"),
-                "auth_provider_x509_cert_url": os.getenv("AUTH_PROVIDER_X509_CERT_URL", 
+                "client_id": get_env_cached("CLIENT_ID"),
+                "project_id": get_env_cached("PROJECT_ID"),
+                "auth_uri": get_env_cached("AUTH_URI", "https://accounts.google.com/o/oauth2/auth"),
+                "token_uri": get_env_cached("TOKEN_URI", "https://oauth2.googleapis.com/token"),
+                "auth_provider_x509_cert_url": get_env_cached("AUTH_PROVIDER_X509_CERT_URL", 
                                                         "https://www.googleapis.com/oauth2/v1/certs"),
-                "client_secret": os.getenv("CLIENT_SECRET"),
-                "redirect_uris": [os.getenv("REDIRECT_URI", "http://localhost")]
+                "client_secret": get_env_cached("CLIENT_SECRET"),
+                "redirect_uris": [get_env_cached("REDIRECT_URI", "http://localhost")]
             }
         }
     
@@ -55,16 +231,38 @@ class GoogleSheetsConnection:
         Returns:
             bool: True if connection successful, False otherwise
         """
+        # Reuse the authorized client, refreshing its token only if it has expired
+        if self.gc is not None and self.spreadsheet is not None:
+            try:
+                auth = self.gc.http_client.auth
+                if not auth.valid:
+                    auth.refresh(Request())
+                return True
+            except RefreshError as e:
+                print(f"Google authorization expired, signing in again: {e}")
+                self.gc = None
+                self._authorized_user = None
+        
         try:
             # Authenticate and get client
-            self.gc, authorized_user = gspread.oauth_from_dict(self.credentials)
+            if self.gc is None:
+                if self._authorized_user is not None:
+                    self.gc, _ = gspread.oauth_from_dict(authorized_user_info=self._authorized_user)
+                else:
+                    self.gc, authorized_user = gspread.oauth_from_dict(self.credentials)
+                    self._authorized_user = json.loads(authorized_user)
+                
+                # Keep-alive connection pool shared by every Sheets and Drive call of this client
+                self.gc.http_client.session.mount(
+                    "https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+                )
             
             # Open or create spreadsheet
             try:
-                self.spreadsheet = self.gc.open(self.spreadsheet_name)
+                self.spreadsheet = _retry(self.gc.open, self.spreadsheet_name)
                 print(f"Connected to existing spreadsheet '{self.spreadsheet_name}'")
             except gspread.SpreadsheetNotFound:
-                self.spreadsheet = self.gc.create(self.spreadsheet_name)
+                self.spreadsheet = _retry(self.gc.create, self.spreadsheet_name)
                 print(f"Created new spreadsheet '{self.spreadsheet_name}'")
             
             return True
@@ -85,38 +283,250 @@ class GoogleSheetsConnection:
         Returns:
             gspread.Worksheet: Worksheet object or None on error
         """
+        # Reuse the handle from an earlier lookup while it is younger than CACHE_TTL_SEC
+        cached = self._ws_cache.get(worksheet_name)
+        if cached and time.monotonic() - cached[0] < float(get_env_cached('CACHE_TTL_SEC', '300')):
+            return cached[1]
+        
         try:
-            worksheet = self.spreadsheet.worksheet(worksheet_name)
+            worksheet = _retry(self.spreadsheet.worksheet, worksheet_name)
             print(f"Using existing worksheet '{worksheet_name}'")
-            return worksheet
         except gspread.WorksheetNotFound:
-            worksheet = self.spreadsheet.add_worksheet(title=worksheet_name, rows=rows, cols=cols)
+            try:
+                worksheet = _retry(self.spreadsheet.add_worksheet, title=worksheet_name, rows=rows, cols=cols)
+            except Exception as e:
+                print(f"Error creating worksheet '{worksheet_name}': {e}")
+                return None
             print(f"Created new worksheet '{worksheet_name}'")
-            return worksheet
         except Exception as e:
             print(f"Error accessing worksheet '{worksheet_name}': {e}")
             return None
+        
+        self._ws_cache[worksheet_name] = (time.monotonic(), worksheet)
+        return worksheet
     
-    def update_worksheet_data(self, worksheet: gspread.Worksheet, data: List[List[str]]) -> bool:
+    def invalidate_worksheet(self, worksheet_name: str) -> None:
+        """
+        Drop a cached worksheet handle so the next lookup fetches it again
+        
+        Args:
+            worksheet_name (str): Name of the worksheet
+        """
+        self._ws_cache.pop(worksheet_name, None)
+    
+    def _clear_ranges(self, ops: List[Tuple[str, Union[Values, pd.DataFrame]]]) -> List[str]:
+        """
+        Get the ranges to clear before replacing the contents of worksheets
+        
+        Worksheets not yet written by this connection are cleared whole; otherwise
+        only the last written extent is cleared, and only if the new payload
+        does not overwrite all of it.
+        
+        Args:
+            ops (List[Tuple[str, Values or pd.DataFrame]]): (worksheet name, data) pairs
+            
+        Returns:
+            List[str]: Absolute A1 ranges to clear
+        """
+        ranges = []
+        for name, data in ops:
+            extent = self._last_extents.get(name)
+            nrows, ncols = _extent(data)
+            if extent is None:
+                ranges.append(absolute_range_name(name))
+            elif nrows < extent[0] or ncols < extent[1]:
+                ranges.append(absolute_range_name(name, _a1_range(*extent)))
+        return ranges
+    
+    def update_worksheet_data(self, worksheet: gspread.Worksheet, data: Values) -> bool:
         """
         Update worksheet with data
         
         Args:
             worksheet (gspread.Worksheet): Worksheet to update
-            data (List[List[str]]): Data to upload
+            data (List[List[str]] or np.ndarray): Data to upload
             
         Returns:
             bool: True if successful, False otherwise
         """
         try:
-            worksheet.clear()
-            worksheet.update(range_name='A1', values=data)
+            clear_ranges = self._clear_ranges([(worksheet.title, data)])
+            if clear_ranges:
+                _retry(self.spreadsheet.values_batch_clear, body={"ranges": clear_ranges})
+            
+            # Each block is its own request, so a retry only resends that block
+            chunk_rows = _chunk_rows()
+            for start in range(0, len(data), chunk_rows):
+                block = data[start:start + chunk_rows]
+                _retry(worksheet.update, range_name=_data_range(block, start + 1), values=_to_values(block),
+                       value_input_option="RAW")
+            self._last_extents[worksheet.title] = _extent(data)
             return True
+        except gspread.exceptions.APIError as e:
+            # The worksheet may have been deleted or renamed
+            self.invalidate_worksheet(worksheet.title)
+            self._last_extents.pop(worksheet.title, None)
+            print(f"Error updating worksheet data: {e}")
+            return False
         except Exception as e:
+            self._last_extents.pop(worksheet.title, None)
             print(f"Error updating worksheet data: {e}")
             return False
     
-    def prepare_dataframe_for_upload(self, df: pd.DataFrame) -> List[List[str]]:
+    def upload_frames(self, worksheet_name: str, frames: Iterable[pd.DataFrame]) -> Optional[Tuple[int, int]]:
+        """
+        Replace the contents of a worksheet with a stream of DataFrames, so only
+        one block of rows is held in memory at a time
+        
+        Args:
+            worksheet_name (str): Name of the worksheet
+            frames (Iterable[pd.DataFrame]): Batches of rows with the same columns
+            
+        Returns:
+            Tuple[int, int]: (data rows, columns) uploaded, None on error
+        """
+        worksheet = self.get_or_create_worksheet(worksheet_name)
+        if not worksheet:
+            return None
+        
+        try:
+            # The new size is not known up front, so clear everything written before
+            clear_ranges = self._clear_ranges([(worksheet_name, [])])
+            if clear_ranges:
+                _retry(self.spreadsheet.values_batch_clear, body={"ranges": clear_ranges})
+            
+            # The first block starts with the header row
+            nrows, ncols = 0, 0
+            for frame in frames:
+                for block in self.iter_upload_chunks(frame, header=nrows == 0):
+                    _retry(worksheet.update, range_name=_data_range(block, nrows + 1), values=_to_values(block),
+                           value_input_option="RAW")
+                    nrows += len(block)
+                ncols = len(frame.columns)
+            self._last_extents[worksheet_name] = (nrows, ncols)
+            return max(nrows - 1, 0), ncols
+        except gspread.exceptions.APIError as e:
+            # The worksheet may have been deleted or renamed
+            self.invalidate_worksheet(worksheet_name)
+            self._last_extents.pop(worksheet_name, None)
+            print(f"Error uploading worksheet data: {e}")
+            return None
+        except Exception as e:
+            self._last_extents.pop(worksheet_name, None)
+            print(f"Error uploading worksheet data: {e}")
+            return None
+    
+    def append_rows(self, worksheet_name: str, data: Values) -> bool:
+        """
+        Append rows after the existing data of a worksheet
+        
+        Args:
+            worksheet_name (str): Name of the worksheet
+            data (List[List[str]] or np.ndarray): Rows to append, without a header
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        worksheet = self.get_or_create_worksheet(worksheet_name)
+        if not worksheet:
+            return False
+        
+        try:
+            # Appends are not idempotent: a 5xx may come after the rows were written,
+            # so only retry rate-limit errors, which are rejected before any write
+            _retry(worksheet.append_rows, _to_values(data), value_input_option="RAW", statuses=(429,))
+            if worksheet_name in self._last_extents:
+                nrows, ncols = _extent(data)
+                last_rows, last_cols = self._last_extents[worksheet_name]
+                self._last_extents[worksheet_name] = (last_rows + nrows, max(last_cols, ncols))
+            return True
+        except gspread.exceptions.APIError as e:
+            # The worksheet may have been deleted or renamed
+            self.invalidate_worksheet(worksheet_name)
+            print(f"Error appending worksheet data: {e}")
+            return False
+        except Exception as e:
+            print(f"Error appending worksheet data: {e}")
+            return False
+    
+    def _values_client(self) -> Any:
+        """
+        Get the client that sends bulk value updates
+        
+        Returns:
+            Any: SheetsV4Client if SHEETS_V4_CLIENT=1, otherwise the gspread spreadsheet
+        """
+        if get_env_cached('SHEETS_V4_CLIENT', '0') != '1':
+            return self.spreadsheet
+        if self._v4_client is None or self._v4_client.spreadsheet_id != self.spreadsheet.id:
+            self._v4_client = SheetsV4Client(self.gc.http_client.auth, self.spreadsheet.id)
+        return self._v4_client
+    
+    def flush_batch(self, ops: List[Tuple[str, Union[Values, pd.DataFrame]]]) -> bool:
+        """
+        Replace the contents of several worksheets with at most one clear request and
+        as few update requests as SHEETS_CHUNK_ROWS allows
+        
+        DataFrames are prepared block by block as the requests are sent, so only
+        one request's worth of cell strings is held in memory at a time.
+        
+        Args:
+            ops (List[Tuple[str, Values or pd.DataFrame]]): (worksheet name, data)
+                pairs; DataFrames are uploaded with their header row
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            # Make sure every worksheet exists; cached handles cost no request
+            for name, _ in ops:
+                if not self.get_or_create_worksheet(name):
+                    return False
+            
+            clear_ranges = self._clear_ranges(ops)
+            if clear_ranges:
+                _retry(self.spreadsheet.values_batch_clear, body={"ranges": clear_ranges})
+            
+            # Split payloads into blocks and pack them into requests of at most chunk_rows rows
+            chunk_rows = _chunk_rows()
+            values_client = self._values_client()
+            batch, batch_rows = [], 0
+            for name, data in ops:
+                if isinstance(data, pd.DataFrame):
+                    blocks = self.iter_upload_chunks(data, chunk_rows)
+                else:
+                    blocks = (data[start:start + chunk_rows] for start in range(0, len(data), chunk_rows))
+                start = 0
+                for block in blocks:
+                    if batch and batch_rows + len(block) > chunk_rows:
+                        _retry(values_client.values_batch_update, {"valueInputOption": "RAW", "data": batch})
+                        batch, batch_rows = [], 0
+                    batch.append({
+                        "range": absolute_range_name(name, _data_range(block, start + 1)),
+                        "values": _to_values(block)
+                    })
+                    batch_rows += len(block)
+                    start += len(block)
+            if batch:
+                _retry(values_client.values_batch_update, {"valueInputOption": "RAW", "data": batch})
+            
+            for name, data in ops:
+                self._last_extents[name] = _extent(data)
+            return True
+        except (gspread.exceptions.APIError, HttpError) as e:
+            # A worksheet may have been deleted or renamed
+            for name, _ in ops:
+                self.invalidate_worksheet(name)
+                self._last_extents.pop(name, None)
+            print(f"Error flushing batch update: {e}")
+            return False
+        except Exception as e:
+            for name, _ in ops:
+                self._last_extents.pop(name, None)
+            print(f"Error flushing batch update: {e}")
+            return False
+    
+    def prepare_dataframe_for_upload(self, df: pd.DataFrame) -> np.ndarray:
         """
         Prepare pandas DataFrame for Google Sheets upload
         
@@ -124,25 +534,102 @@ class GoogleSheetsConnection:
             df (pd.DataFrame): DataFrame to prepare
             
         Returns:
-            List[List[str]]: Cleaned data ready for upload
-        """
-        # Convert DataFrame to list of lists (including headers)
-        data_to_upload = [df.columns.tolist()] + df.values.tolist()
-        
-        # Handle potential data type issues (convert to strings)
-        cleaned_data = []
-        for row in data_to_upload:
-            cleaned_row = []
-            for cell in row:
-                if pd.isna(cell):
-                    cleaned_row.append("")
-                elif isinstance(cell, (pd.Timestamp, datetime)):
-                    cleaned_row.append(cell.strftime("%Y-%m-%d %H:%M:%S"))
-                else:
-                    cleaned_row.append(str(cell))
-            cleaned_data.append(cleaned_row)
+            np.ndarray: Object array of cell strings, header row first
+        """
+        # Fully Arrow-backed frames convert without leaving Arrow memory
+        if (pa is not None and len(df.columns) and df.columns.is_unique
+                and all(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes)):
+            return self.prepare_arrow_for_upload(pa.Table.from_pandas(df, preserve_index=False))
+        
+        # Headers first, then the data rows, filled column by column in place
+        values = np.empty((len(df) + 1, len(df.columns)), dtype=object)
+        values[0] = [str(column) for column in df.columns]
+        
+        # pd.to_datetime moves Arrow timestamps to datetime64, whose %S has no fraction
+        for i, (_, column) in enumerate(df.items()):
+            inferred = infer_dtype(column, skipna=True) if column.dtype == object else None
+            if is_datetime64_any_dtype(column.dtype):
+                column = pd.to_datetime(column).dt.strftime("%Y-%m-%d %H:%M:%S")
+            elif inferred == "datetime":
+                # Datetimes pandas keeps as objects, e.g. with mixed UTC offsets
+                column = column.map(lambda value: value.strftime("%Y-%m-%d %H:%M:%S"), na_action="ignore")
+            elif pa is not None and (inferred == "string" or is_integer_dtype(column.dtype)
+                                     or isinstance(column.dtype, pd.StringDtype)):
+                # Arrow's cast kernel formats these exactly as str() does, without a
+                # Python call per value; floats and booleans would be formatted differently
+                column = pa.array(column, from_pandas=True).cast(pa.string()).fill_null("")
+                values[1:, i] = column.to_numpy(zero_copy_only=False)
+                continue
+            else:
+                column = column.astype(str)
+            values[1:, i] = column.to_numpy(dtype=object)
+        
+        # Blank out missing values
+        values[1:][df.isna().to_numpy(dtype=bool)] = ""
+        return values
+    
+    def iter_upload_chunks(self, df: pd.DataFrame, chunk_rows: Optional[int] = None,
+                           header: bool = True) -> Iterator[np.ndarray]:
+        """
+        Prepare a DataFrame for upload in blocks of rows, so only one block of
+        cell strings is held in memory at a time
+        
+        Args:
+            df (pd.DataFrame): DataFrame to prepare
+            chunk_rows (int, optional): Maximum number of rows per block, header
+                row included, defaults to SHEETS_CHUNK_ROWS
+            header (bool): Start the first block with the header row
+            
+        Yields:
+            np.ndarray: Object array of cell strings
+        """
+        chunk_rows = chunk_rows or _chunk_rows()
         
-        return cleaned_data
+        # The header row takes the place of one data row in the first block
+        first = chunk_rows - 1 if header else 0
+        if header:
+            yield self.prepare_dataframe_for_upload(df.iloc[:first])
+        
+        for start in range(first, len(df), chunk_rows):
+            yield self.prepare_dataframe_for_upload(df.iloc[start:start + chunk_rows])[1:]
+    
+    def prepare_arrow_for_upload(self, table: 'pa.Table') -> np.ndarray:
+        """
+        Prepare an Arrow table for Google Sheets upload
+        
+        Args:
+            table (pa.Table): Table to prepare
+            
+        Returns:
+            np.ndarray: Object array of cell strings, header row first
+        """
+        # Headers first, then the data rows, filled column by column in place
+        values = np.empty((table.num_rows + 1, table.num_columns), dtype=object)
+        values[0] = table.column_names
+        
+        # Convert with Arrow compute kernels, matching prepare_dataframe_for_upload's text
+        for i, column in enumerate(table.columns):
+            column_type = column.type
+            if pa.types.is_floating(column_type):
+                # Arrow formats 1.0 as '1'; keep Python's float formatting. Nulls come
+                # out as NaN, and NaN is blanked like pd.isna does on the pandas path
+                floats = column.to_numpy()
+                strings = floats.astype(str)
+                strings[np.isnan(floats)] = ""
+                values[1:, i] = strings
+                continue
+            
+            if pa.types.is_timestamp(column_type):
+                # Arrow's %S includes fractional seconds, so drop them first
+                column = pc.cast(pc.floor_temporal(column, unit="second"), pa.timestamp("s", column_type.tz))
+                column = pc.strftime(column, format="%Y-%m-%d %H:%M:%S")
+            elif pa.types.is_boolean(column_type):
+                column = pc.if_else(column, "True", "False")
+            elif not pa.types.is_string(column_type):
+                column = column.cast(pa.string())
+            values[1:, i] = column.fill_null("").to_numpy()
+        
+        return values
     
     def create_metadata_sheet(self, table_name: str, df: pd.DataFrame, sync_interval: Optional[float] = None) -> bool:
         """
@@ -161,25 +648,22 @@ class GoogleSheetsConnection:
             if not metadata_sheet:
                 return False
             
-            # Prepare metadata information
-            sync_info = [
-                ["Attribute", "Value"],
-                ["Last Sync Time", datetime.now().strftime("%Y-%m-%d %H:%M:%S")],
-                ["Source Table", table_name],
-                ["Total Rows", len(df)],
-                ["Total Columns", len(df.columns)],
-                ["Data Worksheet", f"{table_name}_data"],
-                ["Spreadsheet URL", self.spreadsheet.url]
-            ]
-            
-            # Add sync interval if provided
+            # Prepare metadata information, with the sync interval if provided
             if sync_interval:
-                sync_info.append(["Sync Interval", f"{sync_interval:.1f} minutes"])
-                sync_info.append(["Status", "Running"])
+                sync_details = {"Sync Interval": f"{sync_interval:.1f} minutes", "Status": "Running"}
             else:
-                sync_info.append(["Sync Type", "One-time"])
+                sync_details = {"Sync Type": "One-time"}
+            metadata = {
+                "Last Sync Time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "Source Table": table_name,
+                "Total Rows": len(df),
+                "Total Columns": len(df.columns),
+                "Data Worksheet": f"{table_name}_data",
+                "Spreadsheet URL": self.spreadsheet.url,
+                **sync_details
+            }
             
-            return self.update_worksheet_data(metadata_sheet, sync_info)
+            return self.update_worksheet_data(metadata_sheet, metadata_values(metadata))
             
         except Exception as e:
             print(f"Error creating metadata sheet: {e}")
@@ -234,9 +718,7 @@ class GoogleSheetsConnection:
             bool: True if successful, False otherwise
         """
         try:
-            worksheet = self.get_or_create_worksheet(worksheet_name, 
-                                                   rows=max(len(df)+10, 100), 
-                                                   cols=max(len(df.columns)+5, 20))
+            worksheet = self.get_or_create_worksheet(worksheet_name)
             if not worksheet:
                 return False
             
@@ -266,9 +748,7 @@ class GoogleSheetsConnection:
                 return False
             
             # Convert metadata dict to list format
-            sync_info = [["Attribute", "Value"]]
-            for key, value in metadata.items():
-                sync_info.append([key, str(value)])
+            sync_info = metadata_values(metadata)
             
             return self.update_worksheet_data(metadata_sheet, sync_info)
             
@@ -284,7 +764,7 @@ def main():
     
     # Check if environment variables are set
     required_vars = ['CLIENT_ID', 'CLIENT_SECRET', 'PROJECT_ID']
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    missing_vars = [var for var in required_vars if not get_env_cached(var)]
     
     if missing_vars:
         print(f"Missing environment variables: {', '.join(missing_vars)}")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Neon to Google Sheets Async Continuous Sync Script
+=================================================
+
+This script runs the continuous sync loop as a coroutine on an existing asyncio
+event loop. Every blocking database and Google Sheets call, including the
+shutdown writes, runs on the sync's worker thread, so the event loop stays free
+for other tasks while they wait on I/O.
+"""
+
+import asyncio
+import functools
+from typing import Any, Callable
+
+# Import from our modular structure
+from src.sync.continuous_sync import NeonToSheetsSync
+from src.utils.logging_setup import setup_logging
+
+class AsyncNeonToSheetsSync(NeonToSheetsSync):
+    async def run(self):
+        """Run the continuous sync loop on the running event loop without blocking it"""
+        return await self._run_loop(self._run_blocking)
+    
+    async def _run_blocking(self, fn: Callable[..., Any], *args) -> Any:
+        """
+        Run a blocking database or Google Sheets call on the sync's worker thread
+        
+        The single worker keeps the database connection and the Sheets session
+        used by one call at a time.
+        
+        Args:
+            fn (Callable): Function to call
+            *args: Arguments for the function
+            
+        Returns:
+            Any: Result of the call
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._pool, functools.partial(fn, *args))
+
+def main():
+    """Main function to run the async continuous sync process"""
+    setup_logging()
+    sync = AsyncNeonToSheetsSync()
+    
+    print("Neon to Google Sheets Async Continuous Sync")
+    print("=" * 50)
+    print(f"Table: {sync.table_name}")
+    print(f"Spreadsheet: {sync.sheets.spreadsheet_name}")
+    print(f"Sync Interval: {sync.sync_interval/60:.1f} minutes")
+    print("=" * 50)
+    
+    try:
+        success = asyncio.run(sync.run())
+        if success:
+            print("\nContinuous sync process completed!")
+        else:
+            print("\nContinuous sync process failed. Please check the errors above.")
+    except KeyboardInterrupt:
+        print("\nSync process interrupted by user")
+        sync.is_running = False
+    except Exception as e:
+        print(f"\nUnexpected error during sync: {e}")
+        sync.is_running = False
+
+if __name__ == "__main__":
+    main()
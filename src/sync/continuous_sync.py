@@ -7,30 +7,65 @@ This script connects to Neon PostgreSQL database, downloads table data,
 and uploads it to Google Sheets with continuous sync capability.
 """
 
-import os
+import asyncio
+import hashlib
+import numpy as np
 import pandas as pd
-from dotenv import load_dotenv
 from datetime import datetime
-import time
 import signal
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional
 
 # Import from our modular structure
-from src.core.database import DatabaseConnection
-from src.core.sheets import GoogleSheetsConnection
+from src.core.database import DatabaseConnection, clear_schema_cache, close_pool
+from src.core.sheets import GoogleSheetsConnection, metadata_values
+from src.core.config import get_env_cached
+from src.utils.logging_setup import setup_logging
 
-# Load environment variables
-load_dotenv()
+def _dataframe_fingerprint(df: pd.DataFrame) -> bytes:
+    """
+    Compute a fingerprint of a DataFrame's column names and values
+    
+    Args:
+        df (pd.DataFrame): DataFrame to fingerprint
+        
+    Returns:
+        bytes: 16-byte digest that changes when the data changes, but not when
+            only the order of the rows does
+    """
+    # Sorting the per-row hashes makes the digest independent of row order, as
+    # rows with equal sort keys can come back in any order
+    row_hashes = np.sort(pd.util.hash_pandas_object(df, index=False).to_numpy())
+    digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=16)
+    digest.update("\x00".join(map(str, df.columns)).encode())
+    return digest.digest()
 
 class NeonToSheetsSync:
     def __init__(self):
         """Initialize the sync class with database and sheets connections"""
         self.db = DatabaseConnection()
         self.sheets = GoogleSheetsConnection()
-        self.table_name = os.getenv('TABLE_NAME')
-        self.sync_interval = int(os.getenv('SYNC_INTERVAL_MINUTES', '2')) * 60  # Convert minutes to seconds
+        self.table_name = get_env_cached('TABLE_NAME')
+        self.sync_interval = int(get_env_cached('SYNC_INTERVAL_MINUTES', '2')) * 60  # Convert minutes to seconds
         self.df = None
+        self._last_hash = None
+        self._last_sync_time = None
+        # Optional monotonic column for appending only new rows after the first full sync
+        self.watermark_column = get_env_cached('WATERMARK_COLUMN')
+        self._watermark = None
+        self._total_rows = 0
+        # Columns of the last full sync; new rows are only appended while they match
+        self._columns = None
         self.is_running = True
+        # Event loop running the sync loop, and the event that wakes it on shutdown
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        # Background download of the next cycle's data, and how long the last download took
+        self._pool = ThreadPoolExecutor(max_workers=1)
+        self._prefetch: Optional[asyncio.Future] = None
+        self._fetch_seconds = 0.0
         
         # Set up signal handler for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -40,6 +75,9 @@ class NeonToSheetsSync:
         """Handle shutdown signals gracefully"""
         print(f"\nReceived shutdown signal ({signum}). Stopping sync...")
         self.is_running = False
+        # Signal handlers run outside the event loop's callbacks
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
     
     def validate_environment(self):
         """Validate required environment variables"""
@@ -47,7 +85,7 @@ class NeonToSheetsSync:
             'PGHOST', 'PGDATABASE', 'PGUSER', 'PGPASSWORD', 'TABLE_NAME',
             'CLIENT_ID', 'CLIENT_SECRET', 'PROJECT_ID'
         ]
-        missing_vars = [var for var in required_vars if not os.getenv(var)]
+        missing_vars = [var for var in required_vars if not get_env_cached(var)]
         
         if missing_vars:
             print(f"Missing environment variables: {', '.join(missing_vars)}")
@@ -82,50 +120,235 @@ class NeonToSheetsSync:
         print(f"Spreadsheet URL: {self.sheets.get_spreadsheet_url()}")
         return True
     
+    def _fetch_table_data(self) -> Optional[pd.DataFrame]:
+        """Download the table data, or only its new rows, recording how long the download took"""
+        start = time.monotonic()
+        if self._watermark is not None:
+            print(f"Downloading rows with {self.watermark_column} after {self._watermark} from table '{self.table_name}'...")
+            df = self.db.get_table_data_since(self.table_name, self.watermark_column, self._watermark)
+        else:
+            print(f"Downloading data from table '{self.table_name}'...")
+            # Sorted by the first column, or by the watermark column so the last row holds the watermark
+            df = self.db.get_table_data(self.table_name, ordered=True, order_by=self.watermark_column)
+            if df is None and self.watermark_column and not self._watermark_column_exists():
+                print(f"Watermark column '{self.watermark_column}' not found, using full syncs")
+                self.watermark_column = None
+                df = self.db.get_table_data(self.table_name, ordered=True)
+        self._fetch_seconds = time.monotonic() - start
+        return df
+    
     def perform_sync_cycle(self):
         """Perform a single sync cycle (download data and update sheets)"""
         try:
-            # Download data from database
-            print(f"Downloading data from table '{self.table_name}'...")
-            self.df = self.db.get_table_data(self.table_name)
+            self.df = self._fetch_table_data()
+            return self._sync_downloaded_data()
             
-            if self.df is None or len(self.df) == 0:
-                print("No data found in table")
-                return False
-            
-            print(f"Downloaded {len(self.df)} rows and {len(self.df.columns)} columns")
-            
-            # Update Google Sheets
-            print("Updating Google Sheets...")
-            if not self.sheets.update_data_worksheet(self.df, f"{self.table_name}_data"):
-                print("Failed to update data worksheet")
-                return False
-            
-            # Update metadata
-            metadata = {
-                "Last Sync Time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "Source Table": self.table_name,
-                "Total Rows": len(self.df),
-                "Total Columns": len(self.df.columns),
-                "Data Worksheet": f"{self.table_name}_data",
-                "Sync Interval": f"{self.sync_interval/60:.1f} minutes",
-                "Status": "Running"
-            }
+        except Exception as e:
+            print(f"Error during sync cycle: {e}")
+            return False
+    
+    async def _perform_sync_cycle(self, run: Callable[..., Awaitable[Any]]) -> bool:
+        """
+        Perform a single sync cycle inside the sync loop
+        
+        Args:
+            run (Callable): Coroutine function that runs a blocking call
             
-            if not self.sheets.update_metadata_worksheet(metadata):
-                print("Failed to update metadata worksheet")
-                return False
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            # Use the data downloaded in the background if there is one, else download it now
+            if self._prefetch is not None:
+                prefetch, self._prefetch = self._prefetch, None
+                self.df = await prefetch
+            else:
+                self.df = await run(self._fetch_table_data)
             
-            current_time = datetime.now().strftime("%H:%M:%S")
-            print(f"[{current_time}] Successfully updated {len(self.df)} rows in Google Sheets")
-            return True
+            return await run(self._sync_downloaded_data)
             
         except Exception as e:
             print(f"Error during sync cycle: {e}")
             return False
     
+    def _sync_downloaded_data(self):
+        """Upload the data in self.df, appending new rows or replacing the data worksheet"""
+        # Resume full syncs if the watermark column is gone or the columns changed
+        if self._watermark is not None:
+            if self.df is None:
+                self._reset_watermark("Failed to download new rows")
+            elif list(self.df.columns) != self._columns:
+                self._reset_watermark("Table columns changed")
+            else:
+                return self._append_new_rows()
+            self.df = self._fetch_table_data()
+        
+        if self.df is None or len(self.df) == 0:
+            print("No data found in table")
+            return False
+        
+        nrows, ncols = len(self.df), len(self.df.columns)
+        print(f"Downloaded {nrows} rows and {ncols} columns")
+        
+        # Only re-upload the data when it changed since the last successful sync
+        data_hash = _dataframe_fingerprint(self.df)
+        changed = data_hash != self._last_hash
+        
+        checked_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        # Metadata for this sync
+        metadata = {
+            "Last Sync Time": checked_time if changed else self._last_sync_time,
+            "Last Checked": checked_time,
+            "Source Table": self.table_name,
+            "Total Rows": nrows,
+            "Total Columns": ncols,
+            "Data Worksheet": f"{self.table_name}_data",
+            "Sync Interval": f"{self.sync_interval/60:.1f} minutes",
+            "Status": "Running"
+        }
+        
+        ops = [("Sync_Metadata", metadata_values(metadata))]
+        if changed:
+            ops.insert(0, (f"{self.table_name}_data", self.df))
+        
+        # Update data and metadata worksheets together
+        print("Updating Google Sheets..." if changed else "Data unchanged, updating metadata only...")
+        if not self.sheets.flush_batch(ops):
+            print("Failed to update Google Sheets")
+            return False
+        
+        self._last_hash = data_hash
+        self._last_sync_time = metadata["Last Sync Time"]
+        self._total_rows = nrows
+        self._columns = list(self.df.columns)
+        self._advance_watermark(self.df)
+        
+        current_time = datetime.now().strftime("%H:%M:%S")
+        if changed:
+            print(f"[{current_time}] Successfully updated {nrows} rows in Google Sheets")
+        else:
+            print(f"[{current_time}] No changes since last sync, skipped data upload")
+        return True
+    
+    def _append_new_rows(self):
+        """Append the rows downloaded since the last watermark and update metadata"""
+        nrows, ncols = len(self.df), len(self.df.columns)
+        sync_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        if nrows:
+            print(f"Downloaded {nrows} new rows")
+            print("Appending new rows to Google Sheets...")
+            # Append block by block without the header row; the worksheet already has one
+            appended = 0
+            for rows in self.sheets.iter_upload_chunks(self.df, header=False):
+                if not self.sheets.append_rows(f"{self.table_name}_data", rows):
+                    break
+                appended += len(rows)
+            
+            # Rows are ordered by the watermark column, so keep what was appended
+            if appended:
+                self._total_rows += appended
+                self._last_sync_time = sync_time
+                self._advance_watermark(self.df.iloc[:appended])
+            if appended < nrows:
+                print("Failed to append rows to Google Sheets")
+                return False
+        
+        metadata = {
+            "Last Sync Time": self._last_sync_time,
+            "Last Checked": sync_time,
+            "Source Table": self.table_name,
+            "Total Rows": self._total_rows,
+            "Total Columns": ncols,
+            "Data Worksheet": f"{self.table_name}_data",
+            "Watermark": f"{self.watermark_column} = {self._watermark}",
+            "Sync Interval": f"{self.sync_interval/60:.1f} minutes",
+            "Status": "Running"
+        }
+        if not self.sheets.flush_batch([("Sync_Metadata", metadata_values(metadata))]):
+            print("Failed to update metadata worksheet")
+            return False
+        
+        current_time = datetime.now().strftime("%H:%M:%S")
+        if nrows:
+            print(f"[{current_time}] Successfully appended {nrows} rows in Google Sheets")
+        else:
+            print(f"[{current_time}] No new rows since last sync")
+        return True
+    
+    def _reset_watermark(self, reason: str):
+        """Drop the watermark so the next download is a full sync that replaces the data worksheet"""
+        print(f"{reason}, falling back to a full sync")
+        self._watermark = None
+        self._last_hash = None
+    
+    def _watermark_column_exists(self) -> bool:
+        """Check the table for the watermark column, bypassing the schema cache"""
+        clear_schema_cache()
+        table_info = self.db.get_table_info(self.table_name)
+        # Assume it exists if the lookup itself failed
+        return table_info is None or any(
+            column['column_name'] == self.watermark_column for column in table_info
+        )
+    
+    def _advance_watermark(self, df: pd.DataFrame):
+        """Move the watermark to the largest value of the watermark column in synced rows"""
+        if not self.watermark_column:
+            return
+        
+        if self.watermark_column not in df.columns:
+            print(f"Watermark column '{self.watermark_column}' not found, using full syncs")
+            self.watermark_column = None
+            return
+        
+        # Rows come sorted by the watermark column on the server, so the last value is
+        # the largest in the column's own type, also for columns kept as text such as numeric
+        values = df[self.watermark_column].dropna()
+        if values.empty:
+            return
+        watermark = values.iloc[-1]
+        # psycopg2 cannot adapt NumPy scalars
+        self._watermark = watermark.item() if isinstance(watermark, np.generic) else watermark
+    
     def start_continuous_sync(self):
         """Start continuous sync process with the specified interval"""
+        return asyncio.run(self._run_loop(self._run_inline))
+    
+    async def _run_inline(self, fn: Callable[..., Any], *args) -> Any:
+        """Run a blocking call directly on the event loop's thread"""
+        return fn(*args)
+    
+    async def _sleep(self, seconds: float) -> bool:
+        """
+        Wait for the given number of seconds, or until a shutdown signal arrives
+        
+        Args:
+            seconds (float): Seconds to wait
+            
+        Returns:
+            bool: True if the sync should stop, False otherwise
+        """
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+        return not self.is_running
+    
+    async def _run_loop(self, run: Callable[..., Awaitable[Any]]) -> bool:
+        """
+        Run the continuous sync loop until a shutdown signal arrives
+        
+        Args:
+            run (Callable): Coroutine function that runs a blocking database or
+                Google Sheets call, such as _run_inline
+                
+        Returns:
+            bool: True if the sync ran and stopped gracefully, False otherwise
+        """
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        
         print("Starting continuous sync process...")
         print(f"Sync interval: {self.sync_interval/60:.1f} minutes")
         print("Press Ctrl+C to stop the sync process")
@@ -136,12 +359,12 @@ class NeonToSheetsSync:
             return False
         
         # Initial setup - Connect to services
-        if not self.connect_to_services():
+        if not await run(self.connect_to_services):
             return False
         
         # Initial data sync
         print("\nPerforming initial sync...")
-        if not self.perform_sync_cycle():
+        if not await self._perform_sync_cycle(run):
             print("Initial sync failed")
             return False
         
@@ -152,13 +375,14 @@ class NeonToSheetsSync:
         
         while self.is_running:
             try:
-                # Wait for the specified interval
-                for i in range(self.sync_interval):
-                    if not self.is_running:
-                        break
-                    time.sleep(1)
-                
-                if not self.is_running:
+                # Wait for the specified interval, or until a shutdown signal arrives. The
+                # download starts as long before the next sync as the last one took, so the
+                # data is ready when the interval ends
+                lead = min(self._fetch_seconds, self.sync_interval)
+                if await self._sleep(self.sync_interval - lead):
+                    break
+                self._prefetch = self._loop.run_in_executor(self._pool, self._fetch_table_data)
+                if await self._sleep(lead):
                     break
                 
                 # Perform sync
@@ -166,19 +390,28 @@ class NeonToSheetsSync:
                 current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 print(f"\n[{current_time}] Starting sync #{sync_count}...")
                 
-                if self.perform_sync_cycle():
+                if await self._perform_sync_cycle(run):
                     print(f"Sync #{sync_count} completed successfully")
                 else:
                     print(f"Sync #{sync_count} failed")
                     
             except Exception as e:
                 print(f"Error during sync cycle: {e}")
-                time.sleep(5)  # Wait a bit before retrying
         
-        # Cleanup
+        # Cleanup; let a background download finish before its connection is released
+        if self._prefetch is not None:
+            await asyncio.gather(self._prefetch, return_exceptions=True)
+            self._prefetch = None
+        await run(self._shutdown, sync_count)
+        self._pool.shutdown(wait=True)
+        return True
+    
+    def _shutdown(self, sync_count: int):
+        """Release connections and mark the sync as stopped in the metadata worksheet"""
         print("\nShutting down sync process...")
         if self.db.connection:
             self.db.disconnect()
+        close_pool()
         
         # Update metadata to show stopped status
         try:
@@ -188,15 +421,15 @@ class NeonToSheetsSync:
                 "Total Syncs Completed": sync_count,
                 "Status": "Stopped"
             }
-            self.sheets.update_metadata_worksheet(final_metadata)
+            self.sheets.flush_batch([("Sync_Metadata", metadata_values(final_metadata))])
         except:
             pass  # Ignore errors during cleanup
             
         print("Sync process stopped gracefully")
-        return True
 
 def main():
     """Main function to run the continuous sync process"""
+    setup_logging()
     sync = NeonToSheetsSync()
     
     print("Neon to Google Sheets Continuous Sync")
@@ -7,25 +7,23 @@ This script performs a single sync operation from Neon PostgreSQL database
 to Google Sheets and then exits.
 """
 
-import os
-import pandas as pd
-from dotenv import load_dotenv
+import itertools
 from datetime import datetime
 
 # Import from our modular structure
 from src.core.database import DatabaseConnection
-from src.core.sheets import GoogleSheetsConnection
-
-# Load environment variables
-load_dotenv()
+from src.core.sheets import GoogleSheetsConnection, metadata_values
+from src.core.config import get_env_cached
+from src.utils.logging_setup import setup_logging
 
 class OneTimeSyncToSheets:
     def __init__(self):
         """Initialize the sync class with database and sheets connections"""
         self.db = DatabaseConnection()
         self.sheets = GoogleSheetsConnection()
-        self.table_name = os.getenv('TABLE_NAME')
-        self.df = None
+        self.table_name = get_env_cached('TABLE_NAME')
+        self.nrows = 0
+        self.ncols = 0
     
     def validate_environment(self):
         """Validate required environment variables"""
@@ -33,7 +31,7 @@ class OneTimeSyncToSheets:
             'PGHOST', 'PGDATABASE', 'PGUSER', 'PGPASSWORD', 'TABLE_NAME',
             'CLIENT_ID', 'CLIENT_SECRET', 'PROJECT_ID'
         ]
-        missing_vars = [var for var in required_vars if not os.getenv(var)]
+        missing_vars = [var for var in required_vars if not get_env_cached(var)]
         
         if missing_vars:
             print(f"Missing environment variables: {', '.join(missing_vars)}")
@@ -70,46 +68,56 @@ class OneTimeSyncToSheets:
         return True
     
     def download_and_upload_data(self):
-        """Download data from database and upload to Google Sheets"""
+        """Stream data from the database to Google Sheets in batches of rows"""
         print(f"Downloading data from table '{self.table_name}'...")
         
-        # Download data from database
-        self.df = self.db.get_table_data(self.table_name)
-        
-        if self.df is None or len(self.df) == 0:
-            print("No data found in table")
+        # Download data from database batch by batch, so the table is never held in memory whole
+        batches = self.db.iter_table_data(self.table_name, ordered=True)
+        try:
+            first = next(batches, None)
+        except Exception as e:
+            print(f"Error downloading table data: {e}")
             return False
         
-        print(f"Successfully downloaded {len(self.df)} rows and {len(self.df.columns)} columns")
-        print(f"Data shape: {self.df.shape}")
-        
-        # Show first few rows for verification
-        print(f"\nFirst 3 rows preview:")
-        print(self.df.head(3).to_string(index=False))
-        
-        # Upload to Google Sheets
-        print("\nUploading data to Google Sheets...")
-        worksheet_name = f"{self.table_name}_data"
-        
-        if not self.sheets.update_data_worksheet(self.df, worksheet_name):
+        try:
+            if first is None or len(first) == 0:
+                print("No data found in table")
+                return False
+            
+            # Show first few rows for verification
+            print(f"\nFirst 3 rows preview:")
+            print(first.head(3).to_string(index=False))
+            
+            worksheet_name = f"{self.table_name}_data"
+            
+            # Upload each batch as soon as it is downloaded
+            print("\nUploading data to Google Sheets...")
+            uploaded = self.sheets.upload_frames(worksheet_name, itertools.chain([first], batches))
+        finally:
+            batches.close()
+        
+        if uploaded is None:
             print("Failed to upload data to Google Sheets")
             return False
         
-        # Update metadata
+        self.nrows, self.ncols = uploaded
+        print(f"Successfully downloaded {self.nrows} rows and {self.ncols} columns")
+        
+        # Metadata for this sync
         metadata = {
             "Last Sync Time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "Source Table": self.table_name,
-            "Total Rows": len(self.df),
-            "Total Columns": len(self.df.columns),
+            "Total Rows": self.nrows,
+            "Total Columns": self.ncols,
             "Data Worksheet": worksheet_name,
             "Sync Type": "One-time"
         }
         
-        if not self.sheets.update_metadata_worksheet(metadata):
-            print("Failed to update metadata")
+        if not self.sheets.flush_batch([("Sync_Metadata", metadata_values(metadata))]):
+            print("Failed to update metadata worksheet")
             return False
         
-        print(f"Successfully uploaded {len(self.df)} rows to Google Sheets")
+        print(f"Successfully uploaded {self.nrows} rows to Google Sheets")
         print(f"Data uploaded to worksheet: '{worksheet_name}'")
         print(f"Spreadsheet URL: {self.sheets.get_spreadsheet_url()}")
         
@@ -132,17 +140,19 @@ class OneTimeSyncToSheets:
         if not self.download_and_upload_data():
             return False
         
+        nrows, ncols = self.nrows, self.ncols
         print("\nSync completed successfully!")
         print(f"Summary:")
         print(f"   • Source: {self.table_name} table in Neon database")
         print(f"   • Destination: {self.sheets.spreadsheet_name} Google Sheet")
-        print(f"   • Records synced: {len(self.df):,}")
-        print(f"   • Columns synced: {len(self.df.columns)}")
+        print(f"   • Records synced: {nrows:,}")
+        print(f"   • Columns synced: {ncols}")
         
         return True
 
 def main():
     """Main function to run the sync process"""
+    setup_logging()
     sync = OneTimeSyncToSheets()
     
     try:
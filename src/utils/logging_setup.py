@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Logging Setup Module
+====================
+
+This module configures application logging for the command-line entry points.
+"""
+
+import logging
+
+from src.core.config import get_env_cached
+
+
+def setup_logging() -> None:
+    """Configure the root logger once, using LOG_LEVEL (default INFO)"""
+    logging.basicConfig(
+        level=get_env_cached('LOG_LEVEL', 'INFO').upper(),
+        format='%(message)s'
+    )